@@ -1,12 +1,71 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import stats
 import sys
 import io
 import base64
+from math import sqrt
+from functools import lru_cache
+from numba import njit
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
+# 只允许重排和融合运算，保留inf/nan语义(数据退化时仍按numpy规则得到inf/nan)
+@njit(cache=True, fastmath={'reassoc', 'contract'}, error_model='numpy')
+def _wavelength_core(x, y):
+    """
+    线性拟合和波长计算的编译内核，x和y须为等长的连续float64数组
+    
+    返回:
+    wavelength, wavelength_uncertainty, slope, std_err, r_squared, intercept
+    """
+    n = x.shape[0]
+    
+    # 第一遍求均值
+    sum_x = 0.0
+    sum_y = 0.0
+    for i in range(n):
+        sum_x += x[i]
+        sum_y += y[i]
+    mx = sum_x / n
+    my = sum_y / n
+    
+    # 第二遍累加离差平方和。拟合优度很高时残差平方和Syy - slope*Sxy对舍入误差极其敏感，
+    # 单遍的原始和或Welford累加都会明显损失斜率标准不确定度的精度，因此保留中心化的两遍算法
+    Sxx = 0.0
+    Sxy = 0.0
+    Syy = 0.0
+    for i in range(n):
+        dx = x[i] - mx
+        dy = y[i] - my
+        Sxx += dx * dx
+        Sxy += dx * dy
+        Syy += dy * dy
+    
+    # 最小二乘闭式解
+    slope = Sxy / Sxx
+    intercept = my - slope * mx
+    r_squared = Sxy * Sxy / (Sxx * Syy) if Syy != 0 else 0.0
+    # 只有两个数据点时直线必然穿过所有点，斜率标准不确定度为0
+    std_err = sqrt(max(Syy - slope * Sxy, 0.0) / ((n - 2) * Sxx)) if n > 2 else 0.0
+    
+    # 波长 = 斜率 * 2 * 1000000 (转换为纳米)
+    wavelength = slope * 2 * 1000000
+    wavelength_uncertainty = std_err * 2 * 1000000
+    
+    return wavelength, wavelength_uncertainty, slope, std_err, r_squared, intercept
+
+def _check_fit_input(fringes, positions):
+    """
+    检查拟合数据，不合法时抛出ValueError(编译内核不做边界检查，须在调用前检查)
+    
+    参数:
+    fringes -- 干涉环圈数(float64数组)
+    positions -- 位移距离(float64数组，mm)
+    """
+    if fringes.ndim != 1 or positions.ndim != 1 or fringes.shape != positions.shape:
+        raise ValueError("圈数和位置必须是长度相同的一维数据")
+    if fringes.size == 0 or np.ptp(fringes) == 0:
+        raise ValueError("所有圈数都相同，无法进行线性拟合")
+
 def calculate_wavelength(fringes, positions):
     """
     使用线性拟合计算波长
@@ -20,20 +79,30 @@ def calculate_wavelength(fringes, positions):
     wavelength_uncertainty -- 波长标准不确定度(nm)
     r_squared -- 拟合优度R²
     """
-    # 转换为numpy数组以便进行计算
-    fringes = np.array(fringes)
-    positions = np.array(positions)
+    # 转换为连续的float64数组后交给编译内核计算(最小二乘闭式解)
+    x = np.ascontiguousarray(fringes, dtype=np.float64)
+    y = np.ascontiguousarray(positions, dtype=np.float64)
+    _check_fit_input(x, y)
     
-    # 线性回归拟合
-    slope, intercept, r_value, p_value, std_err = stats.linregress(fringes, positions)
-    
-    # 波长 = 斜率 * 2 * 1000000 (转换为纳米)
-    wavelength = slope * 2 * 1000000
-    wavelength_uncertainty = std_err * 2 * 1000000
-    r_squared = r_value**2
+    wavelength, wavelength_uncertainty, slope, std_err, r_squared, _ = _wavelength_core(x, y)
     
     return wavelength, wavelength_uncertainty, slope, std_err, r_squared
 
+@njit(cache=True, error_model='numpy')
+def _uncertainty_core(slope, std_err, fringes_range):
+    """总的相对不确定度(%)的编译内核，参数均为float"""
+    if fringes_range == 0:
+        return np.inf
+    
+    # 圈数读取不确定度为0.5圈
+    rel_fringe = 0.5 / fringes_range
+    
+    # 斜率测量的相对不确定度
+    rel_slope = std_err / slope
+    
+    # 总的相对不确定度(平方和的平方根)
+    return sqrt(rel_slope * rel_slope + rel_fringe * rel_fringe) * 100.0
+
 def calculate_uncertainty(slope, std_err, fringes_range):
     """
     计算波长的测量不确定度(考虑圈数读取不确定度)
@@ -44,18 +113,43 @@ def calculate_uncertainty(slope, std_err, fringes_range):
     fringes_range -- 总的干涉环圈数范围
     
     返回:
-    total_uncertainty -- 总的相对不确定度(%)
+    total_uncertainty -- 总的相对不确定度(%)，圈数范围为0时返回inf
     """
-    # 圈数读取不确定度为0.5圈
-    fringe_uncertainty = 0.5 / fringes_range
+    return _uncertainty_core(float(slope), float(std_err), float(fringes_range))
+
+@njit(cache=True)
+def _backlash_core(positions, out):
+    """
+    螺纹空程差校正的编译内核，positions须为连续的float64数组且长度不小于4
     
-    # 斜率测量的相对不确定度
-    slope_uncertainty = std_err / slope
+    返回:
+    out -- 写入了校正后位移距离的输出数组
+    """
+    n = positions.shape[0]
     
-    # 总的相对不确定度(平方和的平方根)
-    total_uncertainty = np.sqrt(slope_uncertainty**2 + fringe_uncertainty**2) * 100
+    # 后面稳定部分的平均间隔(差值之和可直接由首尾相减得到)
+    if n > 4:
+        avg_later_diffs = (positions[n - 1] - positions[3]) / (n - 4)
+    else:
+        avg_later_diffs = (positions[n - 1] - positions[0]) / (n - 1)
+    
+    # 检查前3个差值是否比平均值大5%以上(只需比较其中的最大值，无需逐个分支判断)
+    head_max = max(positions[1] - positions[0],
+                   positions[2] - positions[1],
+                   positions[3] - positions[2])
+    correction_needed = head_max > avg_later_diffs * 1.05
     
-    return total_uncertainty
+    out[:] = positions
+    
+    if correction_needed:
+        # 使用后面稳定部分的平均间隔来校正前面的数据
+        for i in range(1, 4):
+            out[i] = positions[0] + i * avg_later_diffs
+    
+    return out
+
+# 导入时预先编译，避免首次调用时的JIT开销
+_backlash_core(np.zeros(5), np.empty(5))
 
 def correct_backlash_error(positions, fringes):
     """
@@ -72,27 +166,14 @@ def correct_backlash_error(positions, fringes):
     if len(positions) < 4:
         return positions  # 数据点太少，无法校正
     
-    # 计算相邻数据间的差值
-    diffs = np.diff(positions)
-    
-    # 检查前3个差值是否比后面的差值明显偏大
-    avg_later_diffs = np.mean(diffs[3:]) if len(diffs) > 3 else np.mean(diffs)
-    correction_needed = False
-    
-    for i in range(min(3, len(diffs))):
-        if diffs[i] > avg_later_diffs * 1.05:  # 如果差值比平均值大5%以上
-            correction_needed = True
-            break
-    
-    if correction_needed:
-        # 使用后面稳定部分的平均间隔来校正前面的数据
-        corrected_positions = positions.copy()
-        for i in range(1, min(4, len(positions))):
-            ideal_position = positions[0] + i * avg_later_diffs
-            corrected_positions[i] = ideal_position
-        return corrected_positions
-    else:
-        return positions
+    positions = np.ascontiguousarray(positions, dtype=np.float64)
+    return _backlash_core(positions, np.empty_like(positions))
+
+def _path_scale(deviation_cm, path_length_cm):
+    """光路偏移的校正系数1/cosθ"""
+    # 偏移角θ = arctan(偏移量/距离)，而1/cos(arctan(x)) = sqrt(1+x²)
+    ratio = deviation_cm / path_length_cm
+    return sqrt(1.0 + ratio * ratio)
 
 def correct_path_error(fringes, positions, deviation_cm=0, path_length_cm=41):
     """
@@ -111,32 +192,71 @@ def correct_path_error(fringes, positions, deviation_cm=0, path_length_cm=41):
     if deviation_cm == 0:
         return calculate_wavelength(fringes, positions)
     
-    # 计算偏移角θ
-    theta = np.arctan(deviation_cm / path_length_cm)
-    cos_theta = np.cos(theta)
-    
-    # 校正位移数据
-    corrected_positions = positions / cos_theta
+    # 校正位移数据(位移除以cosθ)
+    corrected_positions = np.multiply(positions, _path_scale(deviation_cm, path_length_cm))
     
     return calculate_wavelength(fringes, corrected_positions)
 
-def plot_data_and_fit(fringes, positions, slope, intercept, wavelength, wavelength_uncertainty, r_squared, total_uncertainty):
+@njit(cache=True)
+def _analysis_pipeline(fringes, positions, correct_backlash, scale, out):
+    """
+    完整数值分析流程的编译内核：空程差校正、光路偏移校正、线性拟合、不确定度和波长计算
+    
+    参数:
+    fringes -- 干涉环圈数(连续的float64数组)
+    positions -- 位移距离(连续的float64数组，mm)
+    correct_backlash -- 是否校正螺纹空程差
+    scale -- 光路偏移校正系数，无偏移时为1
+    out -- 输出数组，写入校正空程差并乘以光路偏移校正系数后的位移，即实际参与拟合的数据
+    
+    返回:
+    slope, intercept, std_err, r_squared, total_uncertainty, wavelength, wavelength_uncertainty
+    """
+    n = fringes.shape[0]
+    
+    # 校正螺纹空程差
+    if correct_backlash and n >= 4:
+        _backlash_core(positions, out)
+    else:
+        out[:] = positions
+    
+    # 校正光路偏移，使输出的位移与拟合结果单位一致
+    for i in range(n):
+        out[i] *= scale
+    
+    # 拟合和不确定度与calculate_wavelength、calculate_uncertainty共用同一内核
+    wavelength, wavelength_uncertainty, slope, std_err, r_squared, intercept = _wavelength_core(fringes, out)
+    total_uncertainty = _uncertainty_core(slope, std_err, fringes.max() - fringes.min())
+    
+    return (slope, intercept, std_err, r_squared, total_uncertainty,
+            wavelength, wavelength_uncertainty)
+
+# 导入时预先编译，避免首次调用时的JIT开销
+_analysis_pipeline(np.arange(5.0), np.arange(5.0), True, 1.0, np.empty(5))
+
+# 分析图表的尺寸(英寸)
+_FIGURE_SIZE = (10, 6)
+
+def plot_data_and_fit(fringes, positions, slope, intercept, wavelength, wavelength_uncertainty, r_squared, total_uncertainty, fig=None):
     """
     绘制数据点和拟合直线
     
+    参数:
+    fig -- 可选的空白图形对象(如由pyplot创建、用于窗口显示的图形)，默认新建Figure
+    
     返回:
     fig -- matplotlib图形对象
     """
-    fig = Figure(figsize=(10, 6))
+    if fig is None:
+        fig = Figure(figsize=_FIGURE_SIZE)
     ax = fig.add_subplot(111)
     
     # 绘制原始数据点
     ax.scatter(fringes, positions, color='blue', label='实验数据')
     
-    # 绘制拟合直线
-    x_fit = np.linspace(min(fringes), max(fringes), 100)
-    y_fit = slope * x_fit + intercept
-    ax.plot(x_fit, y_fit, color='red', label='线性拟合')
+    # 绘制拟合直线(直线只需两个端点)
+    x0, x1 = float(np.min(fringes)), float(np.max(fringes))
+    ax.plot([x0, x1], [slope * x0 + intercept, slope * x1 + intercept], color='red', label='线性拟合')
     
     # 添加标签和标题
     ax.set_xlabel('干涉环圈数')
@@ -154,20 +274,38 @@ def plot_data_and_fit(fringes, positions, slope, intercept, wavelength, waveleng
     
     ax.grid(True)
     ax.legend()
-    fig.tight_layout()
+    # 使用固定边距，避免tight_layout对所有元素求解布局
+    fig.subplots_adjust(left=0.1, right=0.95, top=0.92, bottom=0.1)
     
     return fig
 
 def fig_to_base64(fig):
     """将matplotlib图形转换为base64编码"""
+    # 只在首次转换时为图形绑定Agg画布
+    if not isinstance(fig.canvas, FigureCanvas):
+        FigureCanvas(fig)
+    
     buf = io.BytesIO()
-    FigureCanvas(fig).print_png(buf)
-    img_data = base64.b64encode(buf.getvalue()).decode('utf-8')
+    fig.canvas.print_png(buf)
+    
+    # 直接编码缓冲区内容，避免getvalue()产生的额外拷贝
+    with buf.getbuffer() as view:
+        img_data = base64.b64encode(view).decode('ascii')
     return img_data
 
-def analyze_data(fringes, positions, deviation_cm=0, path_length_cm=41, correct_backlash=True):
+def fig_to_svg(fig):
+    """将matplotlib图形转换为可直接内嵌到HTML中的SVG文本"""
+    buf = io.StringIO()
+    fig.savefig(buf, format='svg')
+    svg = buf.getvalue()
+    
+    # 去掉XML声明和DOCTYPE，只保留<svg>元素，并沿用图片的自适应宽度样式
+    svg = svg[svg.index('<svg'):]
+    return svg.replace('<svg', '<svg class="plot-img"', 1)
+
+def analyze_data_numeric(fringes, positions, deviation_cm=0, path_length_cm=41, correct_backlash=True):
     """
-    分析数据并返回结果和图表
+    分析数据并返回数值结果(不绘图)
     
     参数:
     fringes -- 干涉环圈数列表
@@ -177,38 +315,37 @@ def analyze_data(fringes, positions, deviation_cm=0, path_length_cm=41, correct_
     correct_backlash -- 是否校正螺纹空程差
     
     返回:
-    results -- 包含分析结果的字典
-    fig_base64 -- base64编码的图表
+    results -- 包含分析结果的字典，其中corrected_positions为校正空程差和光路偏移后的位移(只读数组)
     """
-    # 数据准备
-    fringes = np.array(fringes)
-    positions = np.array(positions)
+    results = _analyze_numeric_cached(
+        tuple(fringes), tuple(positions), deviation_cm, path_length_cm, correct_backlash)
     
-    # 校正螺纹空程差(如果需要)
-    if correct_backlash:
-        positions = correct_backlash_error(positions, fringes)
+    # 返回副本，避免调用方修改缓存中的结果
+    return dict(results)
+
+@lru_cache(maxsize=8)
+def _analyze_numeric_cached(fringes, positions, deviation_cm, path_length_cm, correct_backlash):
+    """
+    analyze_data_numeric的带缓存实现，相同输入只计算一次
     
-    # 计算波长(考虑光路偏移)
-    if deviation_cm != 0:
-        wavelength, wavelength_uncertainty, slope, std_err, r_squared = correct_path_error(
-            fringes, positions, deviation_cm, path_length_cm)
-    else:
-        wavelength, wavelength_uncertainty, slope, std_err, r_squared = calculate_wavelength(
-            fringes, positions)
+    参数同analyze_data_numeric，但fringes和positions须为元组以便作为缓存键
+    """
+    # 数据准备
+    fringes = np.ascontiguousarray(fringes, dtype=np.float64)
+    positions = np.ascontiguousarray(positions, dtype=np.float64)
+    _check_fit_input(fringes, positions)
+    corrected_positions = np.empty_like(positions)
     
-    # 计算不确定度
-    fringes_range = np.max(fringes) - np.min(fringes)
-    total_uncertainty = calculate_uncertainty(slope, std_err, fringes_range)
+    # 光路偏移校正系数(无偏移时为1)
+    scale = _path_scale(deviation_cm, path_length_cm) if deviation_cm != 0 else 1.0
     
-    # 绘制图表
-    fig = plot_data_and_fit(
-        fringes, positions, slope, intercept=0, 
-        wavelength=wavelength, wavelength_uncertainty=wavelength_uncertainty,
-        r_squared=r_squared, total_uncertainty=total_uncertainty
-    )
+    # 空程差校正、拟合和不确定度计算在同一个编译内核中完成
+    (slope, intercept, std_err, r_squared, total_uncertainty,
+     wavelength, wavelength_uncertainty) = _analysis_pipeline(
+        fringes, positions, bool(correct_backlash), float(scale), corrected_positions)
     
-    # 将图表转换为base64编码
-    fig_base64 = fig_to_base64(fig)
+    # 结果会留在缓存中并返回给每个调用方，设为只读以免被外部修改
+    corrected_positions.flags.writeable = False
     
     # 整理结果
     results = {
@@ -217,23 +354,78 @@ def analyze_data(fringes, positions, deviation_cm=0, path_length_cm=41, correct_
         "total_uncertainty": total_uncertainty,
         "r_squared": r_squared,
         "slope": slope,
-        "std_err": std_err
+        "intercept": intercept,
+        "std_err": std_err,
+        "corrected_positions": corrected_positions
     }
     
-    return results, fig_base64
+    return results
 
-def generate_html(results, fig_base64):
+def render_figure(results, fringes, positions, image_format='svg', fig=None):
     """
-    生成分析结果的HTML页面
+    根据分析结果绘制图表
     
     参数:
-    results -- 包含分析结果的字典
-    fig_base64 -- base64编码的图表
+    results -- analyze_data_numeric返回的结果字典
+    fringes -- 干涉环圈数列表
+    positions -- 绘图用的位移距离列表 (mm)
+    image_format -- 图表编码格式，'svg'、'png'，为None时不编码
+    fig -- 可选的空白图形对象，传给plot_data_and_fit
     
     返回:
-    html -- HTML页面内容
+    fig -- matplotlib图形对象
+    fig_image -- SVG文本或base64编码的PNG图表，image_format为None时为None
+    """
+    if image_format not in ('svg', 'png', None):
+        raise ValueError(f"不支持的图表格式: {image_format!r}，应为'svg'或'png'")
+    
+    fig = plot_data_and_fit(
+        np.asarray(fringes, dtype=np.float64), np.asarray(positions, dtype=np.float64),
+        results["slope"], intercept=results["intercept"], 
+        wavelength=results["wavelength"], wavelength_uncertainty=results["wavelength_uncertainty"],
+        r_squared=results["r_squared"], total_uncertainty=results["total_uncertainty"],
+        fig=fig
+    )
+    
+    # 按需编码图表
+    if image_format == 'svg':
+        fig_image = fig_to_svg(fig)
+    elif image_format == 'png':
+        fig_image = fig_to_base64(fig)
+    else:
+        # image_format为None，只绘图不编码
+        fig_image = None
+    
+    return fig, fig_image
+
+def analyze_data(fringes, positions, deviation_cm=0, path_length_cm=41, correct_backlash=True,
+                 image_format='svg'):
+    """
+    分析数据并返回结果和图表
+    
+    参数:
+    fringes -- 干涉环圈数列表
+    positions -- 位移距离列表 (mm)
+    deviation_cm -- 条纹中心的偏移量(cm)
+    path_length_cm -- S1到毛玻璃屏的距离(cm)
+    correct_backlash -- 是否校正螺纹空程差
+    image_format -- 图表编码格式，'svg'(默认)或'png'
+    
+    返回:
+    results -- 包含分析结果的字典
+    fig_image -- SVG文本或base64编码的PNG图表
     """
-    html = f"""
+    # 不编码(None)只用于render_figure的内部调用，这里必须返回图表
+    if image_format not in ('svg', 'png'):
+        raise ValueError(f"不支持的图表格式: {image_format!r}，应为'svg'或'png'")
+    
+    results = analyze_data_numeric(fringes, positions, deviation_cm, path_length_cm, correct_backlash)
+    _, fig_image = render_figure(results, fringes, results["corrected_positions"], image_format)
+    
+    return results, fig_image
+
+# 分析结果页面中固定不变的部分，只在导入时构建一次，生成页面时只需拼接
+_HTML_PREFIX = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -241,13 +433,13 @@ def generate_html(results, fig_base64):
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; }}
-            .container {{ max-width: 800px; margin: 0 auto; }}
-            .result-box {{ border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 20px; }}
-            .result-title {{ font-size: 18px; font-weight: bold; margin-bottom: 10px; }}
-            .result-item {{ margin-bottom: 5px; }}
-            .plot-container {{ text-align: center; margin: 20px 0; }}
-            .plot-img {{ max-width: 100%; height: auto; }}
+            body { font-family: Arial, sans-serif; margin: 20px; }
+            .container { max-width: 800px; margin: 0 auto; }
+            .result-box { border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 20px; }
+            .result-title { font-size: 18px; font-weight: bold; margin-bottom: 10px; }
+            .result-item { margin-bottom: 5px; }
+            .plot-container { text-align: center; margin: 20px 0; }
+            .plot-img { max-width: 100%; height: auto; }
         </style>
     </head>
     <body>
@@ -256,15 +448,14 @@ def generate_html(results, fig_base64):
             
             <div class="result-box">
                 <div class="result-title">测量结果</div>
-                <div class="result-item"><strong>波长:</strong> {results["wavelength"]:.2f} ± {results["wavelength_uncertainty"]:.2f} nm</div>
-                <div class="result-item"><strong>相对不确定度:</strong> {results["total_uncertainty"]:.2f}%</div>
-                <div class="result-item"><strong>拟合优度 R²:</strong> {results["r_squared"]:.6f}</div>
-                <div class="result-item"><strong>斜率:</strong> {results["slope"]:.8f} mm/圈</div>
-                <div class="result-item"><strong>斜率标准不确定度:</strong> {results["std_err"]:.8f} mm/圈</div>
-            </div>
+"""
+
+_HTML_MIDDLE = """            </div>
             
             <div class="plot-container">
-                <img class="plot-img" src="data:image/png;base64,{fig_base64}" alt="数据拟合图">
+                """
+
+_HTML_SUFFIX = """
             </div>
             
             <div class="result-box">
@@ -278,11 +469,43 @@ def generate_html(results, fig_base64):
     </body>
     </html>
     """
-    return html
 
-def create_online_version():
-    """创建可以在线使用的HTML表单页面"""
-    html = """
+def generate_html(results, fig_image, image_format=None):
+    """
+    生成分析结果的HTML页面
+    
+    参数:
+    results -- 包含分析结果的字典
+    fig_image -- SVG文本或base64编码的PNG图表
+    image_format -- fig_image的格式，'svg'或'png'，为None时根据fig_image的内容判断
+    
+    返回:
+    html -- HTML页面内容
+    """
+    # 只格式化数值结果和图片，其余内容都是预先构建好的常量
+    results_block = '\n'.join((
+        f'                <div class="result-item"><strong>波长:</strong> {results["wavelength"]:.2f} ± {results["wavelength_uncertainty"]:.2f} nm</div>',
+        f'                <div class="result-item"><strong>相对不确定度:</strong> {results["total_uncertainty"]:.2f}%</div>',
+        f'                <div class="result-item"><strong>拟合优度 R²:</strong> {results["r_squared"]:.6f}</div>',
+        f'                <div class="result-item"><strong>斜率:</strong> {results["slope"]:.8f} mm/圈</div>',
+        f'                <div class="result-item"><strong>斜率标准不确定度:</strong> {results["std_err"]:.8f} mm/圈</div>',
+    ))
+    if image_format is None:
+        # 兼容只传入fig_to_base64结果的旧调用方式
+        image_format = 'svg' if fig_image.startswith('<svg') else 'png'
+    
+    if image_format == 'svg':
+        # HTML5允许直接内联SVG，无需PNG编码和base64
+        img_tag = fig_image
+    elif image_format == 'png':
+        img_tag = f'<img class="plot-img" src="data:image/png;base64,{fig_image}" alt="数据拟合图">'
+    else:
+        raise ValueError(f"不支持的图表格式: {image_format!r}，应为'svg'或'png'")
+    
+    return _HTML_PREFIX + results_block + '\n' + _HTML_MIDDLE + img_tag + _HTML_SUFFIX
+
+# 在线版本页面内容固定不变，直接作为模块常量
+_ONLINE_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -493,7 +716,20 @@ def create_online_version():
     </body>
     </html>
     """
-    return html
+
+def create_online_version():
+    """创建可以在线使用的HTML表单页面"""
+    return _ONLINE_HTML
+
+def _parse_data_line(line):
+    """将一行'圈数 位置'输入解析为两个数值，格式错误时返回None"""
+    parts = line.split()
+    if len(parts) != 2:
+        return None
+    try:
+        return float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
 
 def process_data():
     """
@@ -518,30 +754,48 @@ def process_data():
         print("\n请输入数据 (每行输入一组'圈数 位置'，输入空行结束):")
         print("例如：0 0.09212")
         
+        lines = []
         while True:
             line = input().strip()
             if not line:  # 空行结束输入
                 break
-                
+            lines.append(line)
+        
+        # 输入结束后一次性解析全部数据，直接得到float64数组('#'不作为注释，按格式错误处理)
+        data = None
+        if lines:
             try:
-                parts = line.split()
-                fringe = float(parts[0])
-                position = float(parts[1])
-                fringes.append(fringe)
-                positions.append(position)
-                print(f"已添加: 圈数={fringe}, 位置={position}mm")
-            except:
-                print("输入格式错误，请重新输入")
+                data = np.loadtxt(io.StringIO('\n'.join(lines)), dtype=np.float64,
+                                  comments=None, ndmin=2)
+            except ValueError:
+                pass
+        
+        if lines and (data is None or data.shape[1] != 2):
+            # 解析失败时才逐行检查，让用户在原位置重新输入出错的行(数据顺序影响空程差校正)。
+            # 数据直接由检查通过的数值构成，全角数字等loadtxt不接受的写法也能正常输入
+            rows = []
+            for i, line in enumerate(lines, 1):
+                row = _parse_data_line(line)
+                while row is None and line:
+                    print(f"第{i}行输入格式错误: {line}")
+                    line = input("请重新输入该行(直接回车则删除该行): ").strip()
+                    row = _parse_data_line(line)
+                if row is not None:
+                    rows.append(row)
+            data = np.array(rows, dtype=np.float64) if rows else None
+        
+        if data is not None:
+            fringes, positions = data[:, 0], data[:, 1]
     
     elif choice == '2':
         # 批量输入
         print("\n请输入圈数数据 (用空格分隔):")
         fringes_input = input().strip()
-        fringes = [float(f) for f in fringes_input.split()]
+        fringes = np.asarray(fringes_input.split(), dtype=np.float64)
         
         print("请输入对应的位置数据 (用空格分隔)，单位mm:")
         positions_input = input().strip()
-        positions = [float(p) for p in positions_input.split()]
+        positions = np.asarray(positions_input.split(), dtype=np.float64)
         
         # 检查数据长度是否一致
         if len(fringes) != len(positions):
@@ -577,13 +831,15 @@ def process_data():
     except:
         path_length = 41
     
-    # 分析数据
-    results, _ = analyze_data(
+    # 分析数据(整个流程只计算一次，图表在首次需要时才绘制)
+    results = analyze_data_numeric(
         fringes, positions, 
         deviation_cm=deviation, 
         path_length_cm=path_length,
         correct_backlash=correct_backlash
     )
+    # 生成报告和保存图形复用同一个图形对象，不再重复拟合或绘图
+    fig = None
     
     # 显示结果
     print("\n=== 计算结果 ===")
@@ -595,14 +851,9 @@ def process_data():
     # 询问是否生成HTML报告
     save_html = input("\n是否生成HTML分析报告？(y/n): ").lower() == 'y'
     if save_html:
-        results, fig_base64 = analyze_data(
-            fringes, positions, 
-            deviation_cm=deviation, 
-            path_length_cm=path_length,
-            correct_backlash=correct_backlash
-        )
+        fig, fig_image = render_figure(results, fringes, results["corrected_positions"])
         
-        html_content = generate_html(results, fig_base64)
+        html_content = generate_html(results, fig_image)
         
         filename = input("请输入保存的文件名(默认为'michelson_analysis.html'): ")
         if not filename:
@@ -628,26 +879,22 @@ def process_data():
         print(f"在线版本已保存为: {filename}")
         print("注意：此在线版本需要配合后端服务使用，或者嵌入到支持Python的环境中才能完成实际计算")
     
-    # 绘制图形
-    wavelength, wavelength_uncertainty, slope, std_err, r_squared = calculate_wavelength(fringes, positions)
-    fringes_range = np.max(fringes) - np.min(fringes)
-    total_uncertainty = calculate_uncertainty(slope, std_err, fringes_range)
-    
-    fig = plot_data_and_fit(
-        fringes, positions, slope, intercept=0, 
-        wavelength=results['wavelength'], 
-        wavelength_uncertainty=results['wavelength_uncertainty'],
-        r_squared=results['r_squared'],
-        total_uncertainty=results['total_uncertainty']
-    )
-    
-    # 显示图形
-    plt.figure(fig.number)
-    plt.show()
+    # 询问是否显示图形
+    show_choice = input("\n是否显示分析图形？(y/n): ")
+    if show_choice.lower() == 'y':
+        # 只在需要显示时才导入pyplot，避免启动时的后端初始化开销
+        import matplotlib.pyplot as plt
+        
+        # 窗口显示需要由pyplot创建的图形；保存文件使用单独的图形，不受窗口缩放影响
+        render_figure(results, fringes, results["corrected_positions"], image_format=None,
+                      fig=plt.figure(figsize=_FIGURE_SIZE))
+        plt.show()
     
     # 询问是否保存图形
     save_choice = input("\n是否保存分析图形？(y/n): ")
     if save_choice.lower() == 'y':
+        if fig is None:
+            fig, _ = render_figure(results, fringes, results["corrected_positions"], image_format=None)
         filename = input("请输入保存的文件名(默认为'michelson_analysis.png'): ")
         if not filename:
             filename = 'michelson_analysis.png'